@@ -1,8 +1,36 @@
 import pandas as pd
 import numpy as np
+import re
 from datetime import datetime
 import json
 
+# Transaction columns used by the analyses (zoning columns are discovered from the header)
+TRANSACTION_COLUMNS = [
+    'DATE', 'PRICE', 'LOT AREA', 'LOT FRONTAGE', 'BASE FAR', 'BASE ZFA', 'PPZFA',
+    'BOROUGH', 'NEIGHBORHOOD'
+]
+
+# Zoning districts subject to the Sliver Law
+SLIVER_DISTRICTS = [
+    'R7-2', 'R7D', 'R7X', 'R8', 'R9', 'R10',
+    'C1-6', 'C1-7', 'C1-8', 'C1-9', 'C2-6', 'C2-7', 'C2-8',
+    'C4-4D', 'C4-5D', 'C4-5X', 'C4-6A', 'C4-7A',
+    'C5-1A', 'C5-2A', 'C6-2A', 'C6-3A', 'C6-3D', 'C6-3X', 'C6-4A', 'C6-4X'
+]
+SLIVER_PATTERN = re.compile('|'.join(map(re.escape, SLIVER_DISTRICTS)))
+
+def load_csv(path, **kwargs):
+    """Load a CSV with the multi-threaded pyarrow reader, falling back to the C engine"""
+    try:
+        return pd.read_csv(path, engine='pyarrow', **kwargs)
+    except ImportError:
+        return pd.read_csv(path, **kwargs)
+
+def get_transaction_columns(path):
+    """Get the analysis columns present in a transactions CSV, plus every zoning column"""
+    header = pd.read_csv(path, nrows=0).columns
+    return [col for col in header if col in TRANSACTION_COLUMNS or 'ZONING' in col.upper()]
+
 def clean_fed_rates(fed_rates_df):
     """Clean and prepare FED-RATES data"""
     print("\nCleaning Fed Rates data...")
@@ -23,65 +51,42 @@ def clean_transactions(transactions_df):
     """Clean and prepare TRANSACTIONS-PT data"""
     print("\nCleaning Transactions data...")
 
-    # Clean transaction dates
-    transactions_df['DATE'] = pd.to_datetime(transactions_df['DATE'], format='%m/%d/%Y')
+    # Clean transaction dates (already parsed when loaded with parse_dates)
+    if not pd.api.types.is_datetime64_any_dtype(transactions_df['DATE']):
+        transactions_df['DATE'] = pd.to_datetime(transactions_df['DATE'], format='%m/%d/%Y')
 
     # Clean numeric columns
     numeric_cols = ['PRICE', 'LOT AREA', 'LOT FRONTAGE', 'BASE FAR', 'BASE ZFA', 'PPZFA']
     for col in numeric_cols:
+        if pd.api.types.is_numeric_dtype(transactions_df[col]):
+            continue
         transactions_df[col] = pd.to_numeric(
-            transactions_df[col].astype(str).str.replace('$', '').str.replace(',', ''), 
+            transactions_df[col].astype(str).str.replace(r'[$,]', '', regex=True),
             errors='coerce'
         )
 
+    # Store location grouping keys as categoricals
+    for col in ['BOROUGH', 'NEIGHBORHOOD']:
+        if col in transactions_df.columns:
+            transactions_df[col] = transactions_df[col].astype('category')
+
     # Remove transactions with missing dates or prices
     transactions_df = transactions_df.dropna(subset=['DATE', 'PRICE'])
 
     return transactions_df
 
-def create_expanded_rates(fed_rates_df, latest_transaction_date):
-    """Create expanded rate periods with daily granularity"""
-    print("\nCreating expanded rate periods...")
-
-    expanded_rates = []
-
-    # Create daily series for each rate period
-    for i in range(len(fed_rates_df) - 1):
-        start_date = fed_rates_df['Date'].iloc[i]
-        end_date = fed_rates_df['Date'].iloc[i + 1]
-        rate = fed_rates_df['New Rate (%)'].iloc[i]
-
-        if pd.isna(start_date) or pd.isna(end_date) or pd.isna(rate):
-            print(f"Skipping row {i} due to missing data")
-            continue
+def identify_outliers(values, n_std=3):
+    """Identify outliers using z-score method (per column for 2-D input)"""
+    values = np.asarray(values, dtype=np.float64)
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0, ddof=1)
+    # Fused into one numexpr kernel when numexpr is installed
+    return pd.eval(
+        'abs(values - mean) > n_std * std',
+        local_dict={'values': values, 'mean': mean, 'std': std, 'n_std': n_std}
+    )
 
-        dates = pd.date_range(start=start_date, end=end_date - pd.Timedelta(days=1), freq='D')
-        period_rates = pd.DataFrame({
-            'Date': dates,
-            'Rate': rate
-        })
-        expanded_rates.append(period_rates)
-
-    # Add final period
-    final_start = fed_rates_df['Date'].iloc[-1]
-    final_rate = fed_rates_df['New Rate (%)'].iloc[-1]
-
-    if final_start < latest_transaction_date and not pd.isna(final_start) and not pd.isna(final_rate):
-        final_dates = pd.date_range(start=final_start, end=latest_transaction_date, freq='D')
-        final_period = pd.DataFrame({
-            'Date': final_dates,
-            'Rate': final_rate
-        })
-        expanded_rates.append(final_period)
-
-    return pd.concat(expanded_rates, ignore_index=True)
-
-def identify_outliers(df, column, n_std=3):
-    """Identify outliers using z-score method"""
-    z_scores = np.abs((df[column] - df[column].mean()) / df[column].std())
-    return z_scores > n_std
-
-def calculate_market_lag_effects(df):
+def calculate_market_lag_effects(df, monthly_grp):
     """Calculate market response to Fed rate changes and policy events"""
     print("\nAnalyzing market lag effects...")
 
@@ -92,8 +97,7 @@ def calculate_market_lag_effects(df):
 
     # 1. Fed Rate Change Analysis
     # Group data into periods (e.g., 3 months) and calculate average metrics
-    df['YearMonth'] = df['DATE'].dt.to_period('M')
-    monthly_metrics = df.groupby('YearMonth').agg({
+    monthly_metrics = monthly_grp.agg({
         'Rate': 'mean',
         'PPZFA': 'mean',
         'PRICE': ['count', 'mean']
@@ -105,17 +109,19 @@ def calculate_market_lag_effects(df):
     monthly_metrics = monthly_metrics.reset_index()
 
     # Calculate lagged correlations for 3 and 6 month periods
-    for lag_months in [3, 6]:
+    lag_periods = [3, 6]
+    lag_cols = [f'Rate_Lag_{lag_months}M' for lag_months in lag_periods]
+    for lag_months, lag_col in zip(lag_periods, lag_cols):
         # Lag the rate changes
-        monthly_metrics[f'Rate_Lag_{lag_months}M'] = monthly_metrics['Rate_mean'].shift(lag_months)
+        monthly_metrics[lag_col] = monthly_metrics['Rate_mean'].shift(lag_months)
 
-        # Calculate correlations
-        rate_ppzfa_corr = monthly_metrics['PPZFA_mean'].corr(monthly_metrics[f'Rate_Lag_{lag_months}M'])
-        rate_volume_corr = monthly_metrics['PRICE_count'].corr(monthly_metrics[f'Rate_Lag_{lag_months}M'])
+    # Calculate all correlations in one pass (NaNs from the lags are dropped pairwise)
+    lag_corr = monthly_metrics[['PPZFA_mean', 'PRICE_count', *lag_cols]].corr()
 
+    for lag_months, lag_col in zip(lag_periods, lag_cols):
         results[f'{lag_months}M_lag'] = {
-            'rate_ppzfa_correlation': rate_ppzfa_corr,
-            'rate_volume_correlation': rate_volume_corr
+            'rate_ppzfa_correlation': lag_corr.loc['PPZFA_mean', lag_col],
+            'rate_volume_correlation': lag_corr.loc['PRICE_count', lag_col]
         }
 
     # 2. Policy Event Analysis
@@ -124,28 +130,38 @@ def calculate_market_lag_effects(df):
         'covid_outbreak': '2018-01-01'
     }
 
+    # Event windows are contiguous slices of date-ordered data, found by binary search
+    dates_sorted = df['DATE'].values
+    ppzfa_sorted = df['PPZFA'].to_numpy(dtype=np.float64)
+    if not df['DATE'].is_monotonic_increasing:
+        order = np.argsort(dates_sorted, kind='stable')
+        dates_sorted = dates_sorted[order]
+        ppzfa_sorted = ppzfa_sorted[order]
+
     for event, date in policy_events.items():
         event_date = pd.to_datetime(date)
 
         # Analyze 6 months before and after
-        pre_period = df[
-            (df['DATE'] >= event_date - pd.DateOffset(months=6)) &
-            (df['DATE'] < event_date)
-        ]
-        post_period = df[
-            (df['DATE'] >= event_date) &
-            (df['DATE'] < event_date + pd.DateOffset(months=6))
-        ]
+        window = pd.DatetimeIndex([
+            event_date - pd.DateOffset(months=6),
+            event_date,
+            event_date + pd.DateOffset(months=6)
+        ]).values.astype(dates_sorted.dtype)
+        lo, mid, hi = np.searchsorted(dates_sorted, window, side='left')
+        pre_volume = int(mid - lo)
+        post_volume = int(hi - mid)
 
         # Calculate metrics
-        if len(pre_period) > 0 and len(post_period) > 0:
+        if pre_volume > 0 and post_volume > 0:
+            pre_avg_ppzfa = np.nanmean(ppzfa_sorted[lo:mid])
+            post_avg_ppzfa = np.nanmean(ppzfa_sorted[mid:hi])
             results[f'{event}_impact'] = {
-                'pre_avg_ppzfa': pre_period['PPZFA'].mean(),
-                'post_avg_ppzfa': post_period['PPZFA'].mean(),
-                'pre_volume': len(pre_period),
-                'post_volume': len(post_period),
-                'ppzfa_change_pct': ((post_period['PPZFA'].mean() / pre_period['PPZFA'].mean()) - 1) * 100 if pre_period['PPZFA'].mean() != 0 else 0,
-                'volume_change_pct': ((len(post_period) / len(pre_period)) - 1) * 100 if len(pre_period) > 0 else 0
+                'pre_avg_ppzfa': pre_avg_ppzfa,
+                'post_avg_ppzfa': post_avg_ppzfa,
+                'pre_volume': pre_volume,
+                'post_volume': post_volume,
+                'ppzfa_change_pct': ((post_avg_ppzfa / pre_avg_ppzfa) - 1) * 100 if pre_avg_ppzfa != 0 else 0,
+                'volume_change_pct': ((post_volume / pre_volume) - 1) * 100
             }
         else:
             results[f'{event}_impact'] = {
@@ -159,29 +175,30 @@ def calculate_market_lag_effects(df):
 
     # 3. Geographic Response Analysis
     # Analyze how different boroughs respond to rate changes
+    borough_monthly = df.groupby(['BOROUGH', 'YearMonth'], observed=True).agg({
+        'Rate': 'mean',
+        'PPZFA': 'mean',
+        'PRICE': ['count', 'mean']
+    })
+
+    # Flatten column names
+    borough_monthly.columns = [f"{col[0]}_{col[1]}" if isinstance(col, tuple) else col 
+                            for col in borough_monthly.columns]
+    borough_monthly = borough_monthly.reset_index()
+
+    # Calculate 3-month lag correlation for each borough (one partition, shift + corr per group)
+    borough_corr = borough_monthly.groupby('BOROUGH', observed=True)[['PPZFA_mean', 'Rate_mean']].apply(
+        lambda group: group['PPZFA_mean'].corr(group['Rate_mean'].shift(3))
+    )
+    borough_ppzfa = df.groupby('BOROUGH', observed=True)['PPZFA'].mean()
+
     borough_responses = {}
-    for borough in df['BOROUGH'].unique():
-        borough_data = df[df['BOROUGH'] == borough]
-        if len(borough_data) > 0:
-            borough_monthly = borough_data.groupby('YearMonth').agg({
-                'Rate': 'mean',
-                'PPZFA': 'mean',
-                'PRICE': ['count', 'mean']
-            })
-
-            # Flatten column names
-            borough_monthly.columns = [f"{col[0]}_{col[1]}" if isinstance(col, tuple) else col 
-                                    for col in borough_monthly.columns]
-            borough_monthly = borough_monthly.reset_index()
-
-            # Calculate 3-month lag correlation for each borough
-            borough_monthly['Rate_Lag_3M'] = borough_monthly['Rate_mean'].shift(3)
-
-            borough_responses[borough] = {
-                'rate_ppzfa_correlation': borough_monthly['PPZFA_mean'].corr(borough_monthly['Rate_Lag_3M']),
-                'avg_ppzfa': borough_data['PPZFA'].mean(),
-                'ppzfa_premium_discount': ((borough_data['PPZFA'].mean() / baseline_ppzfa) - 1) * 100
-            }
+    for borough, avg_ppzfa in borough_ppzfa.items():
+        borough_responses[borough] = {
+            'rate_ppzfa_correlation': borough_corr[borough],
+            'avg_ppzfa': avg_ppzfa,
+            'ppzfa_premium_discount': ((avg_ppzfa / baseline_ppzfa) - 1) * 100
+        }
 
     results['borough_responses'] = borough_responses
 
@@ -193,8 +210,7 @@ def analyze_time_periods(df):
 
     # Add time period columns
     df['Year'] = df['DATE'].dt.year
-    df['Quarter'] = df['DATE'].dt.quarter
-    df['YearQuarter'] = df['Year'].astype(str) + '-Q' + df['Quarter'].astype(str)
+    df['YearQuarter'] = df['DATE'].dt.to_period('Q')
 
     # Annual analysis
     annual_stats = df.groupby('Year').agg({
@@ -210,6 +226,12 @@ def analyze_time_periods(df):
         'Rate': 'mean'
     }).round(2)
 
+    # Label quarters as e.g. '2024-Q3' (formats one label per group, not per row)
+    quarterly_stats.index = quarterly_stats.index.strftime('%Y-Q%q')
+    df['YearQuarter'] = df['YearQuarter'].astype('category').cat.rename_categories(
+        lambda quarter: quarter.strftime('%Y-Q%q')
+    )
+
     return {
         'annual': annual_stats,
         'quarterly': quarterly_stats
@@ -230,7 +252,7 @@ def analyze_geography(df):
     try:
         if geography_cols['borough']:
             # Borough level analysis
-            borough_stats = df.groupby(geography_cols['borough']).agg({
+            borough_stats = df.groupby(geography_cols['borough'], observed=True).agg({
                 'PRICE': ['count', 'sum', 'mean'],
                 'PPZFA': 'mean'
             }).round(2)
@@ -241,7 +263,7 @@ def analyze_geography(df):
 
         if geography_cols['borough'] and geography_cols['neighborhood']:
             # Neighborhood level analysis
-            neighborhood_stats = df.groupby([geography_cols['borough'], geography_cols['neighborhood']]).agg({
+            neighborhood_stats = df.groupby([geography_cols['borough'], geography_cols['neighborhood']], observed=True).agg({
                 'PRICE': ['count', 'sum', 'mean'],
                 'PPZFA': 'mean'
             }).round(2)
@@ -250,7 +272,8 @@ def analyze_geography(df):
             # Identify hotspots (top 10% by PPZFA)
             hotspot_threshold = df['PPZFA'].quantile(0.9)
             hotspots = df[df['PPZFA'] > hotspot_threshold].groupby(
-                [geography_cols['borough'], geography_cols['neighborhood']]
+                [geography_cols['borough'], geography_cols['neighborhood']],
+                observed=True
             ).size()
             results['hotspots'] = hotspots
         else:
@@ -268,26 +291,26 @@ def analyze_geography(df):
 
     return results
 
-def get_combined_zoning_info(row, zoning_columns):
+def get_combined_zoning_info(df, zoning_columns):
     """Combine zoning information from multiple columns"""
-    all_zonings = []
-    for col in zoning_columns:
-        if pd.notna(row[col]):
-            all_zonings.append(str(row[col]))
-    return ' | '.join(all_zonings) if all_zonings else 'UNKNOWN'
+    zonings = df[zoning_columns].astype(str).where(df[zoning_columns].notna(), '')
+
+    combined = zonings[zoning_columns[0]]
+    for col in zoning_columns[1:]:
+        separator = np.where(combined != '', ' | ', '')
+        combined = combined.where(zonings[col] == '', combined + separator + zonings[col])
+
+    return combined.mask(combined == '', 'UNKNOWN')
 
 def analyze_zoning(df):
     """Analyze zoning categories"""
     print("\nAnalyzing zoning categories...")
 
-    # Check if zoning columns exist
-    zoning_columns = [col for col in df.columns if 'ZONING' in col.upper()]
-    if not zoning_columns:
+    # Combined zoning is only derived when zoning columns exist
+    if 'COMBINED_ZONING' not in df.columns:
         print("Warning: No zoning columns found. Skipping zoning analysis.")
         return {'density': pd.DataFrame()}
 
-    print(f"Using columns {zoning_columns} for zoning analysis")
-
     # Define density categories
     density_mapping = {
         'LOW': ['R1', 'R2', 'R3', 'R4', 'R5'],
@@ -296,23 +319,25 @@ def analyze_zoning(df):
     }
 
     try:
-        # Create combined zoning information
-        df['COMBINED_ZONING'] = df.apply(
-            lambda row: get_combined_zoning_info(row, zoning_columns), 
-            axis=1
-        )
-
-        # Add density category based on combined zoning
-        df['DENSITY_CATEGORY'] = df['COMBINED_ZONING'].apply(
-            lambda x: next(
-                (k for k, v in density_mapping.items() 
-                 if any(z in x for z in v)), 
-                'OTHER'
-            )
+        # Add density category based on combined zoning (first matching category wins).
+        # Each distinct zoning combination is classified once, then rows take their
+        # combination's int8 category code (code -1 for missing zoning maps to OTHER).
+        density_categories = [*density_mapping, 'OTHER']
+        combined_zoning = df['COMBINED_ZONING'].cat
+        density_masks = [
+            combined_zoning.categories.str.contains('|'.join(map(re.escape, v)), regex=True)
+            for v in density_mapping.values()
+        ]
+        category_codes = np.select(
+            density_masks, range(len(density_mapping)), default=len(density_mapping)
+        ).astype(np.int8)
+        category_codes = np.append(category_codes, np.int8(len(density_mapping)))
+        df['DENSITY_CATEGORY'] = pd.Categorical.from_codes(
+            category_codes[combined_zoning.codes], categories=density_categories
         )
 
         # Analyze by density
-        density_stats = df.groupby('DENSITY_CATEGORY', observed=False).agg({
+        density_stats = df.groupby('DENSITY_CATEGORY', observed=True).agg({
             'PRICE': ['count', 'sum', 'mean'],
             'PPZFA': 'mean'
         }).round(2)
@@ -351,34 +376,16 @@ def analyze_sliver_law(df):
     """Analyze Sliver Law impacts"""
     print("\nAnalyzing Sliver Law impacts...")
 
-    # Get zoning columns
-    zoning_columns = [col for col in df.columns if 'ZONING' in col.upper()]
-    if not zoning_columns:
+    # Combined zoning is only derived when zoning columns exist
+    if 'COMBINED_ZONING' not in df.columns:
         print("Warning: No zoning columns found. Skipping Sliver Law analysis.")
         return {'sliver': pd.DataFrame()}
 
-    # Identify properties subject to Sliver Law
-    sliver_districts = [
-        'R7-2', 'R7D', 'R7X', 'R8', 'R9', 'R10',
-        'C1-6', 'C1-7', 'C1-8', 'C1-9', 'C2-6', 'C2-7', 'C2-8',
-        'C4-4D', 'C4-5D', 'C4-5X', 'C4-6A', 'C4-7A',
-        'C5-1A', 'C5-2A', 'C6-2A', 'C6-3A', 'C6-3D', 'C6-3X', 'C6-4A', 'C6-4X'
-    ]
-
     try:
-        # Create combined zoning information if not already exists
-        if 'COMBINED_ZONING' not in df.columns:
-            df['COMBINED_ZONING'] = df.apply(
-                lambda row: get_combined_zoning_info(row, zoning_columns), 
-                axis=1
-            )
-
         # Check if property is subject to Sliver Law based on combined zoning
         df['SLIVER_APPLICABLE'] = (
             (df['LOT FRONTAGE'] < 45) & 
-            df['COMBINED_ZONING'].apply(
-                lambda x: any(district in str(x) for district in sliver_districts)
-            )
+            df['COMBINED_ZONING'].str.contains(SLIVER_PATTERN, na=False)
         )
 
         # Analyze Sliver Law impacts
@@ -469,10 +476,12 @@ def print_analysis_results(results, merged_df):
     print("-"*30)
     if 'borough' in results['geography']:
         borough_stats = results['geography']['borough']
-        for borough in borough_stats.index:
+        for borough, count, avg_ppzfa in zip(
+            borough_stats.index,
+            borough_stats.get(('PRICE', 'count'), []),
+            borough_stats.get(('PPZFA', 'mean'), [])
+        ):
             print(f"\n{borough}:")
-            count = borough_stats.loc[borough, ('PRICE', 'count')]
-            avg_ppzfa = borough_stats.loc[borough, ('PPZFA', 'mean')]
             print(f"Transaction Count: {count:,}")
             print(f"Average PPZFA: ${avg_ppzfa:.2f}")
             premium_discount = ((avg_ppzfa / baseline_ppzfa) - 1) * 100
@@ -483,10 +492,12 @@ def print_analysis_results(results, merged_df):
     print("-"*30)
     if 'density' in results['zoning']:
         density_stats = results['zoning']['density']
-        for category in density_stats.index:
+        for category, count, avg_ppzfa in zip(
+            density_stats.index,
+            density_stats.get(('PRICE', 'count'), []),
+            density_stats.get(('PPZFA', 'mean'), [])
+        ):
             print(f"\n{category}:")
-            count = density_stats.loc[category, ('PRICE', 'count')]
-            avg_ppzfa = density_stats.loc[category, ('PPZFA', 'mean')]
             print(f"Transaction Count: {count:,}")
             print(f"Average PPZFA: ${avg_ppzfa:.2f}")
             premium_discount = ((avg_ppzfa / baseline_ppzfa) - 1) * 100
@@ -497,10 +508,12 @@ def print_analysis_results(results, merged_df):
     print("-"*30)
     if 'frontage' in results['physical']:
         frontage_stats = results['physical']['frontage']
-        for category in frontage_stats.index:
+        for category, count, avg_ppzfa in zip(
+            frontage_stats.index,
+            frontage_stats.get(('PRICE', 'count'), []),
+            frontage_stats.get(('PPZFA', 'mean'), [])
+        ):
             print(f"\n{category}:")
-            count = frontage_stats.loc[category, ('PRICE', 'count')]
-            avg_ppzfa = frontage_stats.loc[category, ('PPZFA', 'mean')]
             print(f"Transaction Count: {count:,}")
             print(f"Average PPZFA: ${avg_ppzfa:.2f}")
             premium_discount = ((avg_ppzfa / baseline_ppzfa) - 1) * 100
@@ -511,11 +524,13 @@ def print_analysis_results(results, merged_df):
     print("-"*30)
     if 'sliver' in results['sliver_law']:
         sliver_stats = results['sliver_law']['sliver']
+        counts = sliver_stats.get(('PRICE', 'count'))
+        avg_ppzfas = sliver_stats.get(('PPZFA', 'mean'))
         for applicable in [True, False]:
             if applicable in sliver_stats.index:
                 print(f"\nSliver Law Applicable: {applicable}")
-                count = sliver_stats.loc[applicable, ('PRICE', 'count')]
-                avg_ppzfa = sliver_stats.loc[applicable, ('PPZFA', 'mean')]
+                count = counts[applicable]
+                avg_ppzfa = avg_ppzfas[applicable]
                 print(f"Transaction Count: {count:,}")
                 print(f"Average PPZFA: ${avg_ppzfa:.2f}")
                 premium_discount = ((avg_ppzfa / baseline_ppzfa) - 1) * 100
@@ -529,37 +544,51 @@ def main():
     print("\nLoading and preparing data...")
 
     # Load FED-RATES data
-    fed_rates_df = pd.read_csv('FED-RATES.csv')
+    fed_rates_df = load_csv('FED-RATES.csv')
     fed_rates_df = clean_fed_rates(fed_rates_df)
 
     # Load TRANSACTIONS-PT data
-    transactions_df = pd.read_csv('TRANSACTIONS-PT.csv')
-    transactions_df = clean_transactions(transactions_df)
-
-    # Create expanded rate periods
-    expanded_rates = create_expanded_rates(
-        fed_rates_df,
-        transactions_df['DATE'].max()
+    transaction_cols = get_transaction_columns('TRANSACTIONS-PT.csv')
+    transactions_df = load_csv(
+        'TRANSACTIONS-PT.csv',
+        usecols=transaction_cols,
+        parse_dates=['DATE'],
+        date_format='%m/%d/%Y'
     )
+    transactions_df = clean_transactions(transactions_df)
 
-    # Merge datasets
+    # Merge datasets, matching each transaction to the rate in effect on its date.
+    # The result stays in date order, so the policy-event windows need no extra sort.
     print("\nMerging datasets...")
-    merged_df = pd.merge(
-        transactions_df,
-        expanded_rates,
+    rates = fed_rates_df[['Date', 'New Rate (%)']].rename(columns={'New Rate (%)': 'Rate'})
+    # Readers may parse dates at different resolutions; merge_asof needs matching key dtypes
+    rates['Date'] = rates['Date'].astype(transactions_df['DATE'].dtype)
+    merged_df = pd.merge_asof(
+        transactions_df.sort_values('DATE', kind='stable'),
+        rates,
         left_on='DATE',
         right_on='Date',
-        how='left'
+        direction='backward'
     )
 
     # Identify and flag outliers
     print("\nIdentifying outliers...")
-    merged_df['PRICE_OUTLIER'] = identify_outliers(merged_df, 'PRICE')
-    merged_df['PPZFA_OUTLIER'] = identify_outliers(merged_df, 'PPZFA')
+    outlier_cols = ['PRICE', 'PPZFA']
+    outliers = identify_outliers(merged_df[outlier_cols].to_numpy(dtype=np.float64))
+    for i, column in enumerate(outlier_cols):
+        merged_df[f'{column}_OUTLIER'] = outliers[:, i]
+
+    # Derive shared grouping columns once for all analyses
+    merged_df['YearMonth'] = merged_df['DATE'].dt.to_period('M')
+    zoning_columns = [col for col in merged_df.columns if 'ZONING' in col.upper()]
+    if zoning_columns:
+        print(f"Using columns {zoning_columns} for zoning analysis")
+        merged_df['COMBINED_ZONING'] = get_combined_zoning_info(merged_df, zoning_columns).astype('category')
+    monthly_grp = merged_df.groupby('YearMonth')
 
     # Calculate market lag effects
     print("\nCalculating market lag effects...")
-    lag_effects = calculate_market_lag_effects(merged_df)
+    lag_effects = calculate_market_lag_effects(merged_df, monthly_grp)
 
     # Perform analyses
     results = {
@@ -585,37 +614,51 @@ if __name__ == "__main__":
     print("\nLoading and preparing data...")
 
     # Load FED-RATES data
-    fed_rates_df = pd.read_csv('FED-RATES.csv')
+    fed_rates_df = load_csv('FED-RATES.csv')
     fed_rates_df = clean_fed_rates(fed_rates_df)
 
     # Load TRANSACTIONS-PT data
-    transactions_df = pd.read_csv('TRANSACTIONS-PT.csv')
-    transactions_df = clean_transactions(transactions_df)
-
-    # Create expanded rate periods
-    expanded_rates = create_expanded_rates(
-        fed_rates_df,
-        transactions_df['DATE'].max()
+    transaction_cols = get_transaction_columns('TRANSACTIONS-PT.csv')
+    transactions_df = load_csv(
+        'TRANSACTIONS-PT.csv',
+        usecols=transaction_cols,
+        parse_dates=['DATE'],
+        date_format='%m/%d/%Y'
     )
+    transactions_df = clean_transactions(transactions_df)
 
-    # Merge datasets
+    # Merge datasets, matching each transaction to the rate in effect on its date.
+    # The result stays in date order, so the policy-event windows need no extra sort.
     print("\nMerging datasets...")
-    merged_df = pd.merge(
-        transactions_df,
-        expanded_rates,
+    rates = fed_rates_df[['Date', 'New Rate (%)']].rename(columns={'New Rate (%)': 'Rate'})
+    # Readers may parse dates at different resolutions; merge_asof needs matching key dtypes
+    rates['Date'] = rates['Date'].astype(transactions_df['DATE'].dtype)
+    merged_df = pd.merge_asof(
+        transactions_df.sort_values('DATE', kind='stable'),
+        rates,
         left_on='DATE',
         right_on='Date',
-        how='left'
+        direction='backward'
     )
 
     # Identify and flag outliers
     print("\nIdentifying outliers...")
-    merged_df['PRICE_OUTLIER'] = identify_outliers(merged_df, 'PRICE')
-    merged_df['PPZFA_OUTLIER'] = identify_outliers(merged_df, 'PPZFA')
+    outlier_cols = ['PRICE', 'PPZFA']
+    outliers = identify_outliers(merged_df[outlier_cols].to_numpy(dtype=np.float64))
+    for i, column in enumerate(outlier_cols):
+        merged_df[f'{column}_OUTLIER'] = outliers[:, i]
+
+    # Derive shared grouping columns once for all analyses
+    merged_df['YearMonth'] = merged_df['DATE'].dt.to_period('M')
+    zoning_columns = [col for col in merged_df.columns if 'ZONING' in col.upper()]
+    if zoning_columns:
+        print(f"Using columns {zoning_columns} for zoning analysis")
+        merged_df['COMBINED_ZONING'] = get_combined_zoning_info(merged_df, zoning_columns).astype('category')
+    monthly_grp = merged_df.groupby('YearMonth')
 
     # Calculate market lag effects
     print("\nCalculating market lag effects...")
-    lag_effects = calculate_market_lag_effects(merged_df)
+    lag_effects = calculate_market_lag_effects(merged_df, monthly_grp)
 
     # Perform analyses
     results = {